@@ -1,16 +1,21 @@
 """
 obsidian2latex - A package to convert Obsidian markdown to LaTeX
 
-This package provides tools to convert Obsidian markdown files with 
+This package provides tools to convert Obsidian markdown files with
 mathematical content to LaTeX, with a focus on preserving equations and formatting.
 """
 
 __version__ = '0.1.0'
 __author__ = 'nmorabowen.com'
 
-# Export the main classes for easy import
-from .obsidian_to_latex import ObsidianLatexConverter
-from .section_converter import ObsidianLatexSectionConverter
-
 # Make it easy to access version information
-__all__ = ['ObsidianLatexConverter', 'ObsidianLatexSectionConverter', '__version__', '__author__']
\ No newline at end of file
+__all__ = ['ObsidianLatexSectionConverter', '__version__', '__author__']
+
+
+def __getattr__(name):
+    # Lazy re-export (PEP 562): importing the package stays cheap and the
+    # converter module is only loaded when the class is first accessed
+    if name == 'ObsidianLatexSectionConverter':
+        from .obsidian_to_latex.converter import ObsidianLatexSectionConverter
+        return ObsidianLatexSectionConverter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,25 +5,26 @@ Focused on converting Obsidian markdown to LaTeX sections for multi-file project
 
 import sys
 import argparse
+import functools
 import logging
 from pathlib import Path
 
-# Update import to match the class name in converter.py
-from .converter import ObsidianLatexSectionConverter
-
 
 def setup_logging(verbose=False):
     """Set up logging configuration"""
     level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format='%(levelname)s: %(message)s'
-    )
+    # Don't attach a second handler if global logging is already configured
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=level,
+            format='%(levelname)s: %(message)s'
+        )
     return logging.getLogger('obsidian2latex-cli')
 
 
-def main():
-    """Main entry point for the CLI"""
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """Build the argument parser (cached so it is only constructed once)"""
     parser = argparse.ArgumentParser(
         description='Convert Obsidian markdown to LaTeX sections for multi-file projects',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -52,10 +53,19 @@ Examples:
                        help='How to handle existing files (default: overwrite)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
     parser.add_argument('--log-file', default='obsidian2latex.log', help='Log file path (default: obsidian2latex.log)')
-    
-    args = parser.parse_args()
+
+    return parser
+
+
+def main():
+    """Main entry point for the CLI"""
+    args = _build_parser().parse_args()
     logger = setup_logging(args.verbose)
-    
+
+    # Imported here so --help and argument errors don't pay the converter's
+    # import cost
+    from .converter import ObsidianLatexSectionConverter
+
     try:
         # Create the converter
         converter = ObsidianLatexSectionConverter(
@@ -9,13 +9,492 @@ formatted LaTeX section files compatible with a multi-file LaTeX project structu
 import re
 import os
 import sys
-import argparse
-import shutil
-from pathlib import Path
+import hashlib
+from functools import lru_cache
 import logging
-import traceback  # Add this import for better error tracing
 import datetime
 
+__version__ = '0.1.0'
+
+# Optional PyYAML for frontmatter: the C-backed CSafeLoader parses lists
+# and nested values correctly and is much faster than the hand scanner,
+# which stays as the fallback when PyYAML isn't installed
+try:
+    import yaml as _yaml
+    try:
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+except ImportError:
+    _yaml = None
+    _YamlLoader = None
+
+# Precompiled regex patterns - compiled once at import time and reused for
+# every conversion instead of going through re's per-call pattern cache
+_OBSIDIAN_IMG_RE = re.compile(r'!\[\[(.*?)\]\]')
+_MD_IMG_RE = re.compile(r'!\[(.*?)\]\((.*?)\)')
+_LIST_ITEM_RE = re.compile(r'^- (.*?)$', re.MULTILINE)
+_ITEM_BLOCK_RE = re.compile(r'((?:^\\item .*\n?)+)', re.MULTILINE)
+
+# Replacement callables defined once: a callable skips re's replacement
+# template parser, which string templates go through on every sub call,
+# and hoisting them avoids rebuilding a closure per conversion
+def _list_item_repl(m):
+    return '\\item ' + m.group(1)
+
+
+def _item_block_repl(m):
+    return '\\begin{itemize}\n' + m.group(1) + '\\end{itemize}\n'
+
+
+def _convert_list_text(text):
+    """Item and itemize substitutions for one unprotected stretch of text"""
+    text = _LIST_ITEM_RE.sub(_list_item_repl, text)
+    # Wrap each run of \item lines in an itemize environment in a
+    # single pass instead of rescanning the content per block
+    return _ITEM_BLOCK_RE.sub(_item_block_repl, text)
+_CODE_BLOCK_RE = re.compile(r'```([^\n]*)\n([\s\S]*?)```')
+_INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+_SANITIZE_RE = re.compile(r'[^\w\.-]')
+
+# Protective regions: code fences and block math (both '$$' delimiters on
+# their own lines, like the lowering machine recognizes) pass through the
+# markdown-level passes untouched. Inline '$$x$$' stays ordinary text and
+# is shielded by the fused pattern's math branch instead.
+_PROTECTED_PATTERN = (
+    r'```[\s\S]*?```'
+    r'|^[ \t]*\$\$[ \t]*\n[\s\S]*?\n[ \t]*\$\$[ \t]*$'
+)
+_PROTECTED_RE = re.compile(_PROTECTED_PATTERN, re.MULTILINE)
+
+# Block comment stripper for the contiguous string: protected regions are
+# matched first so a '%%' inside them is left alone. Comments can span
+# lines, so this must run before any pass segments the content.
+_BLOCK_COMMENT_RE = re.compile(
+    r'(' + _PROTECTED_PATTERN + r')|%%[\s\S]*?%%', re.MULTILINE)
+
+
+def _block_comment_repl(m):
+    return m.group(1) or ''
+
+@lru_cache(maxsize=2048)
+def _sanitize(filename):
+    """
+    Return the (clean_filename, caption, label) triple for a figure file.
+    Memoized globally: across a multi-document build the same figure name
+    shows up repeatedly and only pays the regex/replace work once.
+    """
+    clean_filename = _SANITIZE_RE.sub('_', filename)
+    # splitext keeps interior dots (e.g. 'fig.v2.png' -> 'fig.v2') where
+    # split('.') would truncate the caption at the first one
+    stem, _ext = os.path.splitext(filename)
+    caption = stem.replace('_', ' ')
+    label = f"fig:{clean_filename.replace('.', '_')}"
+    return clean_filename, caption, label
+
+
+@lru_cache(maxsize=256)
+def _build_figure(raw, figures_dir):
+    """
+    Build the LaTeX figure block for an Obsidian image target like
+    'image.png|400'. Memoized so documents that reference the same image
+    repeatedly only pay the sanitize/caption/label work once.
+    """
+    # Extract image path and options
+    image_path = raw.split('|')[0].strip()
+
+    # Extract image options like width
+    size_info = ""
+    if '|' in raw:
+        size = raw.split('|')[1].strip()
+        if size.isdigit():
+            size_info = f"[width={size}pt]"
+
+    # Get just the filename without path, plus its caption and label
+    clean_filename, caption, label = _sanitize(os.path.basename(image_path))
+
+    # Use raw f-string (fr) to properly handle backslashes
+    return fr"""
+\begin{{figure}}[htbp]
+    \centering
+    \includegraphics{size_info}{{{figures_dir}/{clean_filename}}}
+    \caption{{{caption}}}
+    \label{{{label}}}
+\end{{figure}}
+"""
+
+
+@lru_cache(maxsize=256)
+def _build_md_figure(alt_text, image_path, figures_dir):
+    """Build the LaTeX figure block for a standard Markdown image, memoized"""
+    filename = os.path.basename(image_path)
+
+    # Use raw f-string for proper backslash handling
+    return fr"""
+\begin{{figure}}[htbp]
+    \centering
+    \includegraphics{{{figures_dir}/{filename}}}
+    \caption{{{alt_text}}}
+    \label{{fig:{filename.replace('.', '_')}}}
+\end{{figure}}
+"""
+
+
+# Image extensions as a tuple so str.endswith can test them all in one C call
+_IMG_EXT_TUPLE = ('.png', '.jpg', '.jpeg', '.pdf', '.svg', '.excalidraw.png')
+
+@lru_cache(maxsize=8)
+def _header_replacer(level_adjustment):
+    """
+    Return the substitution callback for _HEADER_RE at a given adjustment
+
+    Memoized: level adjustments come from a handful of values, so repeated
+    conversions reuse the same closure instead of rebuilding it per call.
+    """
+    def replace_header(m, cmds=_SECTION_CMDS, adj=level_adjustment):
+        latex_level = max(0, min(len(cmds) - 1, len(m.group(1)) - 1 + adj))
+        return f'{cmds[latex_level]}{{{m.group(2)}}}'
+    return replace_header
+
+
+class SegBuf:
+    """
+    Rope-like segment buffer for chained regex substitutions
+
+    Applying a substitution keeps the content as a list of segments:
+    unchanged regions are re-referenced rather than copied, so a chain of
+    passes allocates O(matches) new strings instead of a full copy of the
+    document per pass. Patterns that must span segment boundaries (e.g.
+    grouping consecutive lines) have to run before the content is
+    segmented or after join().
+    """
+
+    __slots__ = ('parts',)
+
+    def __init__(self, content):
+        self.parts = [content]
+
+    def sub(self, pattern, repl):
+        """Apply a compiled pattern with a string or callable replacement"""
+        new_parts = []
+        append = new_parts.append
+        for part in self.parts:
+            last = 0
+            for m in pattern.finditer(part):
+                if m.start() > last:
+                    append(part[last:m.start()])
+                append(repl(m) if callable(repl) else m.expand(repl))
+                last = m.end()
+            if last == 0:
+                append(part)
+            elif last < len(part):
+                append(part[last:])
+        self.parts = new_parts
+
+    def join(self):
+        """Materialize the buffer back into a single string"""
+        return ''.join(self.parts)
+
+
+# Inputs larger than this are converted line-by-line by _Lowerer instead of
+# being slurped through the whole-string pipeline
+_STREAM_THRESHOLD = 512_000  # ~512 KB
+
+# Inputs smaller than this also go through _Lowerer: for tiny notes the
+# per-pass method-call overhead outweighs the regex work, so one line
+# walk is cheaper than the multi-pass pipeline
+_SMALL_THRESHOLD = 2048
+
+# In-memory result memo for batch runs converting the same note repeatedly
+# within one process; bounded by evicting the oldest entry. The persistent
+# disk cache below covers rebuilds across processes.
+_RESULT_MEMO = {}
+_RESULT_MEMO_MAX = 256
+
+
+def _memo_store(key, content):
+    """Remember a conversion result, evicting the oldest entry when full"""
+    if len(_RESULT_MEMO) >= _RESULT_MEMO_MAX:
+        _RESULT_MEMO.pop(next(iter(_RESULT_MEMO)))
+    _RESULT_MEMO[key] = content
+
+
+# Persistent result cache: converted .tex content keyed by input path,
+# mtime, size, level adjustment, figures dir and converter version, so
+# rebuild loops over an unchanged vault skip the whole pipeline
+_CACHE_LIMIT_BYTES = 256 * 1024 * 1024
+
+
+def _cache_dir():
+    """Return the on-disk cache directory for converted notes"""
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'obsidian2latex')
+
+
+def _evict_cache(cache_dir, limit=_CACHE_LIMIT_BYTES):
+    """Delete oldest cache entries until the directory is under the limit"""
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.is_file(follow_symlinks=False):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+    if total <= limit:
+        return
+    for mtime, size, path in sorted(entries):
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= limit:
+            break
+
+
+# 256-byte table that zeroes everything except the characters that can start
+# an inline construct; bytes.translate with it is a tight C loop, so lines
+# containing none of them can skip the regex engine entirely
+_INTERESTING = bytes(c if chr(c) in '*`~[!$%' else 0 for c in range(256))
+
+
+class _Lowerer:
+    """
+    Line-oriented lowering state machine for very large notes
+
+    Processes the input one line at a time, so peak memory stays
+    proportional to the largest single block (code fence, math block)
+    instead of the whole document plus one intermediate copy per
+    conversion pass. Inline constructs within a text line go through the
+    same fused _INLINE_RE dispatch as the regular pipeline.
+    """
+
+    TEXT, FRONTMATTER, CODE, MATH, COMMENT = range(5)
+
+    def __init__(self, converter, level_adjustment=0):
+        self.converter = converter
+        self.level_adjustment = level_adjustment
+        self.out = []
+        self.state = self.TEXT
+        self.first_line = True
+        self.in_list = False
+        self.code_lang = ''
+        self.code_lines = []
+        self.frontmatter_lines = []
+        self.fm_open_line = ''
+        self.comment_lines = []
+        self.ignore_comments = False
+
+    def lower(self, lines):
+        """Consume an iterable of lines and return the lowered LaTeX string"""
+        for line in lines:
+            self._feed(line)
+        if self.state == self.COMMENT:
+            # Unmatched '%%': not a comment after all — replay the
+            # buffered lines the way the whole-string pass keeps them
+            self.state = self.TEXT
+            self.ignore_comments = True
+            pending, self.comment_lines = self.comment_lines, []
+            for line in pending:
+                self._feed(line)
+        self._close_list()
+        if self.state == self.CODE:
+            # Unterminated fence: emit what we collected as-is
+            self.out.append(f'```{self.code_lang}\n')
+            self.out.extend(self.code_lines)
+        elif self.state == self.FRONTMATTER:
+            # Unterminated frontmatter: the opening '---' was a horizontal
+            # rule or malformed metadata, not frontmatter — keep the text
+            # instead of swallowing the whole document
+            self.out.append(self.fm_open_line)
+            self.out.extend(self.frontmatter_lines)
+        return ''.join(self.out)
+
+    def _feed(self, line):
+        first = self.first_line
+        self.first_line = False
+
+        if self.state == self.FRONTMATTER:
+            if line.strip() == '---':
+                self.state = self.TEXT
+                # Reuse the regular frontmatter parser on the small block
+                self.converter.extract_frontmatter(
+                    '---\n' + ''.join(self.frontmatter_lines) + '---\n')
+            else:
+                self.frontmatter_lines.append(line)
+            return
+
+        if self.state == self.CODE:
+            if line.startswith('```'):
+                self._flush_code()
+            else:
+                self.code_lines.append(line)
+            return
+
+        if self.state == self.MATH:
+            self.out.append(line)
+            if line.strip() == '$$':
+                self.state = self.TEXT
+            return
+
+        if self.state == self.COMMENT:
+            idx = line.find('%%')
+            if idx < 0:
+                self.comment_lines.append(line)
+                return
+            self.state = self.TEXT
+            self.comment_lines = []
+            # Fall through and process the remainder of the line — even a
+            # bare newline, which the whole-string stripper also keeps
+            line = line[idx + 2:]
+
+        # TEXT state
+        if first and line.strip() == '---':
+            self.state = self.FRONTMATTER
+            self.fm_open_line = line
+            return
+
+        if line.startswith('```'):
+            self._close_list()
+            self.state = self.CODE
+            self.code_lang = line[3:].strip()
+            self.code_lines = []
+            return
+
+        stripped = line.strip()
+        if stripped == '$$':
+            self._close_list()
+            self.state = self.MATH
+            self.out.append(line)
+            return
+
+        # A line opening an unclosed %% comment: keep the text before it
+        # and drop everything until the closing marker, buffering the
+        # dropped lines so an unmatched '%%' can be restored at EOF
+        if not self.ignore_comments and line.count('%%') % 2 == 1:
+            idx = line.rindex('%%')
+            self.comment_lines = [line[idx:]]
+            line = line[:idx]
+            self.state = self.COMMENT
+            if not line.strip():
+                return
+
+        if line.startswith('- '):
+            if not self.in_list:
+                self.out.append('\\begin{itemize}\n')
+                self.in_list = True
+            self.out.append('\\item ' + self._inline(line[2:]))
+            return
+
+        self._close_list()
+
+        match = _HEADER_RE.match(line)
+        if match:
+            latex_level = max(0, min(len(_SECTION_CMDS) - 1,
+                                     len(match.group(1)) - 1 + self.level_adjustment))
+            self.out.append(f'{_SECTION_CMDS[latex_level]}'
+                            f'{{{self._inline(match.group(2))}}}\n')
+            return
+
+        self.out.append(self._inline(line))
+
+    def _inline(self, text):
+        # Pre-filter: most lines contain no inline trigger character, so
+        # short-circuit before touching the regex engine
+        if not text.encode('latin-1', 'replace').translate(_INTERESTING).strip(b'\x00'):
+            return text
+        return _INLINE_RE.sub(self.converter._inline_dispatch, text)
+
+    def _close_list(self):
+        if self.in_list:
+            self.out.append('\\end{itemize}\n')
+            self.in_list = False
+
+    def _flush_code(self):
+        code = ''.join(self.code_lines)
+        if self.code_lang:
+            self.out.append(f'\\begin{{lstlisting}}[language={self.code_lang}]\n'
+                            f'{code}\\end{{lstlisting}}\n')
+        else:
+            self.out.append(f'\\begin{{verbatim}}\n{code}\\end{{verbatim}}\n')
+        self.state = self.TEXT
+        self.code_lang = ''
+        self.code_lines = []
+
+
+# os.sendfile only accepts a regular file as out_fd on Linux (and
+# Solaris/Android); on macOS/BSD it exists but requires a socket, so gate
+# on platform the way shutil's fast-copy path does
+_USE_SENDFILE = (hasattr(os, 'sendfile')
+                 and sys.platform.startswith(('linux', 'android', 'sunos')))
+
+
+def _copy_file(src, dst, size):
+    """
+    Copy a file between two raw fds, using os.sendfile (zero user-space
+    buffer) where the platform supports it
+    """
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if _USE_SENDFILE:
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            else:
+                while True:
+                    chunk = os.read(src_fd, 1 << 20)
+                    if not chunk:
+                        break
+                    os.write(dst_fd, chunk)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+# All header levels (1..5) handled by one pattern; the callback picks the
+# LaTeX command from the number of leading hashes
+_HEADER_RE = re.compile(r'^(#{1,5}) (.*?)$', re.MULTILINE)
+_SECTION_CMDS = ('\\section', '\\subsection', '\\subsubsection',
+                 '\\paragraph', '\\subparagraph')
+
+# Optional linear-time regex engine: google-re2 matches without
+# backtracking, so adversarial input (long runs of *, `, ~, [) can't blow
+# up the fused inline pass. Fall back to stdlib re when it isn't installed.
+try:
+    import re2 as _re_engine  # provided by the optional google-re2 package
+except ImportError:
+    _re_engine = re
+
+# Fused inline pattern: one alternation covering every inline construct so a
+# single pass over the content replaces the old chain of separate re.sub
+# passes (comments, images, links, emphasis, inline code). Code fences and
+# math come first in the alternation so they win over emphasis/link branches
+# and act as protective regions that are passed through untouched.
+_INLINE_PATTERN = (
+    r'(?P<fence>```[^\n]*\n[\s\S]*?```)'
+    r'|(?P<math>\$\$[\s\S]*?\$\$|\$[^\n$]+\$)'
+    r'|(?P<comment>%%[\s\S]*?%%)'
+    r'|(?P<oimg>!\[\[(?P<oimg_target>[^\]]*)\]\])'
+    r'|(?P<mimg>!\[(?P<mimg_alt>[^\]]*)\]\((?P<mimg_path>[^)]*)\))'
+    r'|(?P<wikidisp>\[\[(?P<wikidisp_target>[^\]|]+)\|(?P<wikidisp_text>[^\]]+)\]\])'
+    r'|(?P<wiki>\[\[(?P<wiki_target>[^\]]+)\]\])'
+    r'|(?P<mdlink>\[(?P<mdlink_text>[^\]]+)\]\((?P<mdlink_url>[^)]+)\))'
+    r'|(?P<bold>\*\*(?P<bold_text>[^*\n]+)\*\*)'
+    r'|(?P<italic>\*(?P<italic_text>[^*\n]+)\*)'
+    r'|(?P<strike>~~(?P<strike_text>[^~\n]+)~~)'
+    r'|(?P<icode>`(?P<icode_text>[^`\n]+)`)'
+)
+try:
+    _INLINE_RE = _re_engine.compile(_INLINE_PATTERN)
+except Exception:
+    # re2 rejects constructs it can't run in linear time; use stdlib re then
+    _INLINE_RE = re.compile(_INLINE_PATTERN)
+
 class ObsidianLatexSectionConverter:
     """
     A class to convert Obsidian markdown to LaTeX sections for integration with existing projects
@@ -34,47 +513,58 @@ class ObsidianLatexSectionConverter:
         """
         self.input_file = input_file
         self.output_file = output_file
+        self._input_basename = os.path.basename(input_file) if input_file else ''
+        self._input_abspath = os.path.abspath(input_file) if input_file else ''
         self.figures_dir = figures_dir or "figures"
         self.log_file = log_file
         
-        # Set up logging to both file and console
+        # All instances share the module-level logger; handlers are attached
+        # once so batch runs don't tear down and rebuild them per file
         self.logger = logging.getLogger('ObsidianLatexSectionConverter')
         self.logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+
+        if not self.logger.handlers:
+            # Create formatter
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+            # File handler (append mode, so one run's files share a log)
+            try:
+                file_handler = logging.FileHandler(log_file, mode='a')
+                file_handler.setFormatter(formatter)
+                file_handler.setLevel(logging.DEBUG)  # Always log everything to file
+                self.logger.addHandler(file_handler)
+            except Exception as e:
+                print(f"Warning: Could not set up log file: {e}")
+
+            # Console handler
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(formatter)
+            console_handler.setLevel(logging.DEBUG if verbose else logging.INFO)
+            self.logger.addHandler(console_handler)
+
+            # Don't propagate to root logger
+            self.logger.propagate = False
         
-        # Clear any existing handlers
-        self.logger.handlers = []
-        
-        # Create formatter
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        
-        # File handler
-        try:
-            file_handler = logging.FileHandler(log_file, mode='w')
-            file_handler.setFormatter(formatter)
-            file_handler.setLevel(logging.DEBUG)  # Always log everything to file
-            self.logger.addHandler(file_handler)
-        except Exception as e:
-            print(f"Warning: Could not set up log file: {e}")
-        
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        console_handler.setLevel(logging.DEBUG if verbose else logging.INFO)
-        self.logger.addHandler(console_handler)
-        
-        # Don't propagate to root logger
-        self.logger.propagate = False
-        
-        self.logger.info(f"Initializing converter: input={input_file}, output={output_file}")
+        self.logger.info("Initializing converter: input=%s, output=%s", input_file, output_file)
         
+        # Offset of the first character after the frontmatter block, cached
+        # by extract_frontmatter for remove_frontmatter
+        self._frontmatter_end = None
+
+        # (content, utf-8 bytes) pair kept by convert() so save() can reuse
+        # the encoded form instead of encoding the document again
+        self._encoded = None
+
         # Document metadata from frontmatter
         self.metadata = {
             'title': '',
             'tags': []
         }
         
-        # Store image file extensions
-        self.image_extensions = ['.png', '.jpg', '.jpeg', '.pdf', '.svg', '.excalidraw.png']
+        # Store image file extensions; the tuple form lets str.endswith
+        # check them all in one C call and tracks instance customizations
+        self.image_extensions = list(_IMG_EXT_TUPLE)
+        self._image_ext_tuple = tuple(self.image_extensions)
 
     def extract_frontmatter(self, content):
         """
@@ -89,33 +579,37 @@ class ObsidianLatexSectionConverter:
         frontmatter = {}
         try:
             self.logger.debug("Attempting to extract frontmatter")
-            match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-            
-            if match:
-                yaml_text = match.group(1)
-                self.logger.debug(f"Found frontmatter: {yaml_text}")
-                for line in yaml_text.split('\n'):
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        
-                        # Process lists in YAML (like tags)
-                        if value.startswith('-'):
-                            frontmatter[key] = [item.strip('- ') for item in value.split('\n')]
-                        else:
-                            frontmatter[key] = value
-            
+            # Explicit scan over the head of the document instead of a
+            # DOTALL regex that can walk the whole file when the closing
+            # delimiter is missing. The end offset is cached so
+            # remove_frontmatter doesn't have to re-scan.
+            self._frontmatter_end = 0
+            if content.startswith('---\n'):
+                end = content.find('\n---\n', 3)
+                if end >= 0:
+                    self._frontmatter_end = end + 5
+                    yaml_text = content[4:end]
+                    self.logger.debug("Found frontmatter: %s", yaml_text)
+                    if _yaml is not None:
+                        parsed = _yaml.load(yaml_text, Loader=_YamlLoader)
+                        if isinstance(parsed, dict):
+                            frontmatter = parsed
+                    else:
+                        for line in yaml_text.split('\n'):
+                            colon = line.find(':')
+                            if colon < 0:
+                                continue
+                            frontmatter[line[:colon].strip()] = line[colon + 1:].strip()
+
             # Update metadata with extracted frontmatter
             for key, value in frontmatter.items():
                 if key in self.metadata:
                     self.metadata[key] = value
             
-            self.logger.debug(f"Extracted frontmatter: {frontmatter}")
+            self.logger.debug("Extracted frontmatter: %s", frontmatter)
             return frontmatter
         except Exception as e:
-            self.logger.error(f"Error extracting frontmatter: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error extracting frontmatter")
             return {}
 
     def remove_frontmatter(self, content):
@@ -130,12 +624,20 @@ class ObsidianLatexSectionConverter:
         """
         try:
             self.logger.debug("Removing frontmatter")
-            result = re.sub(r'^---\s*\n(.*?)\n---\s*\n', '', content, flags=re.DOTALL)
-            self.logger.debug(f"First 50 chars after frontmatter removal: {repr(result[:50])}")
+            # Reuse the end offset cached by extract_frontmatter when it
+            # still matches this content; otherwise scan for it directly
+            end = getattr(self, '_frontmatter_end', None)
+            if end is None or (end and not content.startswith('---\n')):
+                end = 0
+                if content.startswith('---\n'):
+                    pos = content.find('\n---\n', 3)
+                    if pos >= 0:
+                        end = pos + 5
+            result = content[end:]
+            self.logger.debug("First 50 chars after frontmatter removal: %r", result[:50])
             return result
         except Exception as e:
-            self.logger.error(f"Error removing frontmatter: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error removing frontmatter")
             return content
 
     def convert_headers(self, content, level_adjustment=0):
@@ -151,41 +653,31 @@ class ObsidianLatexSectionConverter:
         """
         try:
             self.logger.debug("Converting headers")
-            # Define the LaTeX section commands by level
-            section_commands = [
-                '\\section',
-                '\\subsection',
-                '\\subsubsection',
-                '\\paragraph',
-                '\\subparagraph'
-            ]
-            
-            # Convert headers based on the adjusted level
-            for i in range(5):
-                md_level = i + 1  # Markdown level (# = 1, ## = 2, etc.)
-                latex_level = i + level_adjustment
-                
-                # Ensure we don't go out of bounds
-                if latex_level < 0:
-                    latex_level = 0
-                if latex_level >= len(section_commands):
-                    latex_level = len(section_commands) - 1
-                    
-                # Create the regex pattern for this header level
-                hashes = '#' * md_level
-                pattern = r'^' + re.escape(hashes) + r' (.*?)$'
-                
-                # Replace with the appropriate LaTeX section command
-                self.logger.debug(f"Converting level {md_level} headers to {section_commands[latex_level]}")
-                replacement = fr'{section_commands[latex_level]}{{\1}}'
-                content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
-            
-            return content
+
+            # One pass over the content: the callback maps the number of
+            # leading hashes (clamped to the available commands) to the
+            # right LaTeX section command
+            return _HEADER_RE.sub(_header_replacer(level_adjustment), content)
         except Exception as e:
-            self.logger.error(f"Error converting headers: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error converting headers")
             return content
 
+    def _convert_region(self, text, level_adjustment=0):
+        """
+        Lists, headers and inline constructs for one region of text lying
+        outside any code fence or math block
+
+        List grouping spans consecutive lines, so it runs while the region
+        is still contiguous; headers and the fused inline pass then run
+        over a segment buffer that carries unchanged stretches between
+        passes by reference instead of copying them.
+        """
+        text = self.convert_lists(text)
+        buf = SegBuf(text)
+        buf.sub(_HEADER_RE, _header_replacer(level_adjustment))
+        buf.sub(_INLINE_RE, self._inline_dispatch)
+        return buf.join()
+
     def convert_lists(self, content):
         """
         Convert markdown lists to LaTeX itemize environment
@@ -196,23 +688,26 @@ class ObsidianLatexSectionConverter:
         Returns:
             str: Content with lists converted
         """
+        # A substring test is a single C call, far cheaper than running the
+        # list regexes over a note that has no list items at all
+        if '\n- ' not in content and not content.startswith('- '):
+            return content
         try:
             self.logger.debug("Converting lists")
-            # Convert list items
-            content = re.sub(r'^- (.*?)$', r'\\item \1', content, flags=re.MULTILINE)
-            
-            # Find all sequences of \item lines
-            item_blocks = re.findall(r'((?:^\\item .*\n)+)', content, re.MULTILINE)
-            
-            # Replace each block with an itemize environment
-            for i, block in enumerate(item_blocks):
-                self.logger.debug(f"Processing list block {i+1} of {len(item_blocks)}")
-                content = content.replace(block, fr"\begin{{itemize}}\n{block}\end{{itemize}}\n")
-            
-            return content
+            # List-looking lines inside code fences or math blocks stay
+            # verbatim, matching the line-walking lowering machine
+            if '```' in content or '$$' in content:
+                parts = []
+                last = 0
+                for m in _PROTECTED_RE.finditer(content):
+                    parts.append(_convert_list_text(content[last:m.start()]))
+                    parts.append(m.group(0))
+                    last = m.end()
+                parts.append(_convert_list_text(content[last:]))
+                return ''.join(parts)
+            return _convert_list_text(content)
         except Exception as e:
-            self.logger.error(f"Error converting lists: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error converting lists")
             return content
 
     def convert_images(self, content):
@@ -225,158 +720,103 @@ class ObsidianLatexSectionConverter:
         Returns:
             str: Content with images converted
         """
+        # Both image syntaxes start with '![' — skip the scans when absent
+        if '![' not in content:
+            return content
         try:
             self.logger.debug("Converting images")
-            
-            def replace_image(match):
-                try:
-                    # Extract image path and options
-                    image_path = match.group(1).split('|')[0].strip()
-                    
-                    # Extract image options like width
-                    size_info = ""
-                    if '|' in match.group(1):
-                        size = match.group(1).split('|')[1].strip()
-                        if size.isdigit():
-                            size_info = f"[width={size}pt]"
-                    
-                    # Get just the filename without path
-                    filename = os.path.basename(image_path)
-                    clean_filename = re.sub(r'[^\w\.-]', '_', filename)
-                    
-                    # Create a proper caption and label
-                    caption = filename.replace('_', ' ').split('.')[0]
-                    label = f"fig:{clean_filename.replace('.', '_')}"
-                    
-                    self.logger.debug(f"Processing image: {image_path} -> {clean_filename}")
-                    
-                    # Use raw f-string (fr) to properly handle backslashes
-                    return fr"""
-\begin{{figure}}[htbp]
-    \centering
-    \includegraphics{size_info}{{{self.figures_dir}/{clean_filename}}}
-    \caption{{{caption}}}
-    \label{{{label}}}
-\end{{figure}}
-"""
-                except Exception as e:
-                    self.logger.error(f"Error in replace_image: {e}")
-                    self.logger.error(traceback.format_exc())
-                    return match.group(0)  # Return original text on error
-            
+
             # Standard Obsidian image syntax: ![[image.png]]
             self.logger.debug("Processing Obsidian image syntax")
-            content = re.sub(r'!\[\[(.*?)\]\]', replace_image, content)
-            
+            content = _OBSIDIAN_IMG_RE.sub(
+                lambda m: self._build_obsidian_figure(m.group(1), m.group(0)), content)
+
             # Standard Markdown image syntax: ![alt text](image.png)
             self.logger.debug("Processing standard Markdown image syntax")
-            content = re.sub(
-                r'!\[(.*?)\]\((.*?)\)', 
-                lambda m: self._process_md_image(m), 
-                content
-            )
+            content = _MD_IMG_RE.sub(
+                lambda m: self._build_md_figure(m.group(1), m.group(2), m.group(0)), content)
             
             return content
         except Exception as e:
-            self.logger.error(f"Error converting images: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error converting images")
             return content
-    
-    def _process_md_image(self, match):
-        """Helper method to process standard Markdown images"""
-        try:
-            alt_text = match.group(1)
-            image_path = match.group(2)
-            filename = os.path.basename(image_path)
-            
-            self.logger.debug(f"Processing Markdown image: {image_path}")
-            
-            # Use raw f-string for proper backslash handling
-            return fr"""
-\begin{{figure}}[htbp]
-    \centering
-    \includegraphics{{{self.figures_dir}/{filename}}}
-    \caption{{{alt_text}}}
-    \label{{fig:{filename.replace('.', '_')}}}
-\end{{figure}}
-"""
-        except Exception as e:
-            self.logger.error(f"Error processing Markdown image: {e}")
-            self.logger.error(traceback.format_exc())
-            return match.group(0)  # Return original text on error
 
-    def convert_internal_links(self, content):
+    def _build_obsidian_figure(self, raw, original):
         """
-        Convert Obsidian internal links to LaTeX references or text
-        
+        Build a LaTeX figure block for an Obsidian image target like 'image.png|400'
+
         Args:
-            content (str): The markdown content
-            
+            raw (str): The text inside ![[...]]
+            original (str): The full original match, returned on error
+
         Returns:
-            str: Content with internal links converted
+            str: The LaTeX figure block
         """
         try:
-            self.logger.debug("Converting internal links")
-            # Handle links with display text: [[actual|display]]
-            content = re.sub(r'\[\[(.*?)\|(.*?)\]\]', r'\\textit{\2}', content)
-            
-            # Handle regular internal links
-            content = re.sub(r'\[\[(.*?)\]\]', r'\\textit{\1}', content)
-            
-            # Handle markdown links
-            content = re.sub(r'\[(.*?)\]\((.*?)\)', r'\\href{\2}{\1}', content)
-            
-            return content
+            self.logger.debug("Processing image: %s", raw)
+            return _build_figure(raw, self.figures_dir)
         except Exception as e:
-            self.logger.error(f"Error converting internal links: {e}")
-            self.logger.error(traceback.format_exc())
-            return content
+            self.logger.exception("Error building figure")
+            return original  # Return original text on error
 
-    def remove_comments(self, content):
-        """
-        Remove Obsidian comments from the content
-        
-        Args:
-            content (str): The markdown content
-            
-        Returns:
-            str: Content without comments
-        """
+    def _build_md_figure(self, alt_text, image_path, original):
+        """Helper method to process standard Markdown images"""
         try:
-            self.logger.debug("Removing comments")
-            return re.sub(r'%%.*?%%', '', content, flags=re.DOTALL)
+            self.logger.debug("Processing Markdown image: %s", image_path)
+            return _build_md_figure(alt_text, image_path, self.figures_dir)
         except Exception as e:
-            self.logger.error(f"Error removing comments: {e}")
-            self.logger.error(traceback.format_exc())
-            return content
+            self.logger.exception("Error processing Markdown image")
+            return original  # Return original text on error
 
-    def convert_emphasis(self, content):
+    def convert_inline(self, content):
         """
-        Convert markdown text formatting to LaTeX
-        
+        Convert all inline markdown constructs in a single pass
+
+        One scan over the content handles comments, images, links, emphasis,
+        and inline code via the fused _INLINE_RE alternation. Code fences and
+        math regions match first in the alternation and are returned
+        unchanged so their contents are protected from the other rewrites.
+
         Args:
             content (str): The markdown content
-            
+
         Returns:
-            str: Content with text formatting converted
+            str: Content with inline constructs converted
         """
         try:
-            self.logger.debug("Converting emphasis")
-            # Handle bold text
-            content = re.sub(r'\*\*(.*?)\*\*', r'\\textbf{\1}', content)
-            
-            # Handle italic text
-            content = re.sub(r'\*(.*?)\*', r'\\textit{\1}', content)
-            
-            # Handle strikethrough
-            content = re.sub(r'~~(.*?)~~', r'\\sout{\1}', content)
-            
-            return content
+            self.logger.debug("Converting inline constructs (fused pass)")
+            return _INLINE_RE.sub(self._inline_dispatch, content)
         except Exception as e:
-            self.logger.error(f"Error converting emphasis: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error converting inline constructs")
             return content
 
+    def _inline_dispatch(self, m):
+        """Return the LaTeX replacement for a single fused-pattern match"""
+        if m.group('fence') is not None or m.group('math') is not None:
+            # Protective regions: pass code fences and math through untouched
+            return m.group(0)
+        if m.group('comment') is not None:
+            return ''
+        if m.group('oimg') is not None:
+            return self._build_obsidian_figure(m.group('oimg_target'), m.group(0))
+        if m.group('mimg') is not None:
+            return self._build_md_figure(m.group('mimg_alt'), m.group('mimg_path'), m.group(0))
+        if m.group('wikidisp') is not None:
+            return f"\\textit{{{m.group('wikidisp_text')}}}"
+        if m.group('wiki') is not None:
+            return f"\\textit{{{m.group('wiki_target')}}}"
+        if m.group('mdlink') is not None:
+            return f"\\href{{{m.group('mdlink_url')}}}{{{m.group('mdlink_text')}}}"
+        if m.group('bold') is not None:
+            return f"\\textbf{{{m.group('bold_text')}}}"
+        if m.group('italic') is not None:
+            return f"\\textit{{{m.group('italic_text')}}}"
+        if m.group('strike') is not None:
+            return f"\\sout{{{m.group('strike_text')}}}"
+        if m.group('icode') is not None:
+            return f"\\texttt{{{m.group('icode_text')}}}"
+        return m.group(0)
+
     def convert_code_blocks(self, content):
         """
         Convert markdown code blocks to LaTeX environments
@@ -387,6 +827,9 @@ class ObsidianLatexSectionConverter:
         Returns:
             str: Content with code blocks converted
         """
+        # Fenced blocks need a triple backtick; skip the scan otherwise
+        if '```' not in content:
+            return content
         try:
             self.logger.debug("Converting code blocks")
             def replace_code_block(match):
@@ -398,52 +841,25 @@ class ObsidianLatexSectionConverter:
                     if code.strip().startswith('$') and code.strip().endswith('$'):
                         return match.group(0)
                     
-                    self.logger.debug(f"Processing code block with language: {language}")    
+                    self.logger.debug("Processing code block with language: %s", language)
+                    # The captured code keeps its trailing newline, so none
+                    # is added before the closing \end
                     if language == "":
-                        return fr"\begin{{verbatim}}\n{code}\n\end{{verbatim}}"
+                        return f"\\begin{{verbatim}}\n{code}\\end{{verbatim}}"
                     else:
-                        return fr"\begin{{lstlisting}}[language={language}]\n{code}\n\end{{lstlisting}}"
+                        return f"\\begin{{lstlisting}}[language={language}]\n{code}\\end{{lstlisting}}"
                 except Exception as e:
-                    self.logger.error(f"Error in replace_code_block: {e}")
-                    self.logger.error(traceback.format_exc())
+                    self.logger.exception("Error in replace_code_block")
                     return match.group(0)
             
-            content = re.sub(r'```(.*?)\n(.*?)```', replace_code_block, content, flags=re.DOTALL)
-            
-            # Handle inline code
-            content = re.sub(r'`([^`]+)`', r'\\texttt{\1}', content)
-            
-            return content
-        except Exception as e:
-            self.logger.error(f"Error converting code blocks: {e}")
-            self.logger.error(traceback.format_exc())
-            return content
+            content = _CODE_BLOCK_RE.sub(replace_code_block, content)
 
-    def preserve_math(self, content):
-        """
-        Preserve and process math environments in the document
-        
-        Args:
-            content (str): The markdown content
-            
-        Returns:
-            str: Content with math properly handled
-        """
-        try:
-            self.logger.debug("Preserving math environments")
-            # Handle aligned environment properly
-            content = re.sub(r'\\begin{aligned}(.*?)\\end{aligned}', 
-                          r'\\begin{aligned}\1\\end{aligned}', 
-                          content, flags=re.DOTALL)
-            
-            # Keep display math blocks as is - they're already in LaTeX format
-            # In a multi-file LaTeX project, we might want to use equation environments
-            # but it's safer to keep the original format to avoid numbering issues
+            # Handle inline code
+            content = _INLINE_CODE_RE.sub(r'\\texttt{\1}', content)
             
             return content
         except Exception as e:
-            self.logger.error(f"Error preserving math: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error converting code blocks")
             return content
 
     def process_images(self):
@@ -466,41 +882,85 @@ class ObsidianLatexSectionConverter:
                     self.logger.warning(f"Failed to create figures directory: {e}")
                     return
             
-            # Try to find Obsidian attachments
-            input_dir = os.path.dirname(os.path.abspath(self.input_file))
-            possible_attachment_dirs = [
-                os.path.join(input_dir, "attachments"),
-                os.path.join(input_dir, "assets"),
-                os.path.join(input_dir, "images"),
-                os.path.join(os.path.dirname(input_dir), "attachments"),
-            ]
-            
+            # Try to find Obsidian attachments: one scandir of the input's
+            # directory replaces a stat probe per candidate name, and every
+            # present candidate contributes files, like the original loop
+            input_dir = os.path.dirname(
+                getattr(self, '_input_abspath', None) or os.path.abspath(self.input_file))
+            candidate_names = ("attachments", "assets", "images")
+            attachment_dirs = []
+            try:
+                with os.scandir(input_dir) as it:
+                    present = {e.name for e in it
+                               if e.name in candidate_names and e.is_dir(follow_symlinks=False)}
+                attachment_dirs = [os.path.join(input_dir, name)
+                                   for name in candidate_names if name in present]
+            except OSError as e:
+                self.logger.warning(f"Could not scan {input_dir}: {e}")
+
+            # An attachments directory one level up is also a candidate
+            parent_attachments = os.path.join(os.path.dirname(input_dir), "attachments")
+            if os.path.isdir(parent_attachments):
+                attachment_dirs.append(parent_attachments)
+
             # Track whether we found any attachments
-            found_attachments = False
-            
-            for attachment_dir in possible_attachment_dirs:
-                if os.path.exists(attachment_dir):
-                    self.logger.info(f"Found attachments in: {attachment_dir}")
-                    found_attachments = True
-                    
-                    # Copy all image files to figures directory
-                    for file in os.listdir(attachment_dir):
-                        file_path = os.path.join(attachment_dir, file)
-                        if (os.path.isfile(file_path) and 
-                            any(file.lower().endswith(ext) for ext in self.image_extensions)):
-                            try:
-                                shutil.copy2(file_path, figures_dir)
-                                self.logger.debug(f"Copied {file} to figures directory")
-                            except Exception as e:
-                                self.logger.warning(f"Failed to copy {file}: {e}")
-                    
-                    self.logger.info(f"Copied available images to {figures_dir}")
+            found_attachments = bool(attachment_dirs)
+
+            if attachment_dirs:
+                # Collect the image files to copy. os.scandir avoids the
+                # extra stat per entry that listdir+isfile costs, and
+                # endswith on a tuple checks all extensions in one C call.
+                # Rebuilt from the instance list so customized extension
+                # sets are honoured.
+                ext_tuple = self._image_ext_tuple
+                if list(ext_tuple) != self.image_extensions:
+                    ext_tuple = self._image_ext_tuple = tuple(self.image_extensions)
+                tasks = []
+                for attachment_dir in attachment_dirs:
+                    self.logger.info("Found attachments in: %s", attachment_dir)
+                    with os.scandir(attachment_dir) as it:
+                        for entry in it:
+                            if not entry.is_file(follow_symlinks=False):
+                                continue
+                            if not entry.name.lower().endswith(ext_tuple):
+                                continue
+                            tasks.append((entry.path,
+                                          os.path.join(figures_dir, entry.name),
+                                          entry.stat().st_size))
+
+                # Copy in a small thread pool: sendfile/open/close release
+                # the GIL, so syscall latency overlaps across workers. Each
+                # future is checked individually so one failed copy can't
+                # abort the rest of the batch.
+                if len(tasks) > 1:
+                    from concurrent.futures import ThreadPoolExecutor, as_completed
+                    workers = min(8, os.cpu_count() or 4, len(tasks))
+                    with ThreadPoolExecutor(max_workers=workers) as ex:
+                        futures = {ex.submit(self._copy_one, task): task[0]
+                                   for task in tasks}
+                        for future in as_completed(futures):
+                            exc = future.exception()
+                            if exc is not None:
+                                self.logger.warning(
+                                    f"Failed to copy {os.path.basename(futures[future])}: {exc}")
+                elif tasks:
+                    self._copy_one(tasks[0])
+
+                self.logger.info("Copied available images to %s", figures_dir)
             
             if not found_attachments:
                 self.logger.warning("No attachments directory found. You may need to manually copy images.")
         except Exception as e:
-            self.logger.error(f"Error processing images: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error processing images")
+
+    def _copy_one(self, task):
+        """Copy a single (src, dst, size) attachment; logging is thread-safe"""
+        src, dst, size = task
+        try:
+            _copy_file(src, dst, size)
+            self.logger.debug("Copied %s to figures directory", os.path.basename(src))
+        except Exception as e:
+            self.logger.warning(f"Failed to copy {os.path.basename(src)}: {e}")
 
     def add_section_comment(self, content):
         """
@@ -514,22 +974,22 @@ class ObsidianLatexSectionConverter:
         """
         try:
             self.logger.debug("Adding section comment")
-            comment = "% Auto-generated from Obsidian markdown\n"
-            comment += f"% Source: {os.path.basename(self.input_file)}\n"
+            parts = ["% Auto-generated from Obsidian markdown\n",
+                     f"% Source: {self._input_basename}\n"]
             if self.metadata['title']:
-                comment += f"% Title: {self.metadata['title']}\n"
+                parts.append(f"% Title: {self.metadata['title']}\n")
             if self.metadata['tags']:
                 if isinstance(self.metadata['tags'], list):
                     tags_str = ', '.join(self.metadata['tags'])
                 else:
                     tags_str = str(self.metadata['tags'])
-                comment += f"% Tags: {tags_str}\n"
-            comment += "%\n\n"
-            
-            return comment + content
+                parts.append(f"% Tags: {tags_str}\n")
+            parts.append("%\n\n")
+            parts.append(content)
+
+            return ''.join(parts)
         except Exception as e:
-            self.logger.error(f"Error adding section comment: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error adding section comment")
             return content
 
     def convert(self, level_adjustment=0):
@@ -540,77 +1000,206 @@ class ObsidianLatexSectionConverter:
             str: The converted LaTeX content
         """
         try:
-            self.logger.info(f"Starting conversion of {self.input_file}")
+            self.logger.info("Starting conversion of %s", self.input_file)
             
             # Normalize path
             normalized_path = os.path.normpath(self.input_file)
-            self.logger.debug(f"Normalized input path: {normalized_path}")
+            self.logger.debug("Normalized input path: %s", normalized_path)
             
             # Check if input file exists
             if not os.path.exists(normalized_path):
-                self.logger.error(f"Input file '{normalized_path}' not found.")
+                self.logger.error("Input file '%s' not found.", normalized_path)
                 return None
             
             self.input_file = normalized_path  # Use normalized path
-            
-            # Read the content
-            self.logger.debug(f"Reading content from {self.input_file}")
+            self._input_basename = os.path.basename(normalized_path)
+            self._input_abspath = os.path.abspath(normalized_path)
+
+            # Check the in-memory memo, then the persistent cache: an
+            # unchanged note converted with the same settings skips the
+            # whole pipeline
+            st = os.stat(normalized_path)
+            memo_key = (self._input_abspath, st.st_mtime_ns,
+                        st.st_size, level_adjustment, self.figures_dir)
+            memoized = _RESULT_MEMO.get(memo_key)
+            if memoized is not None:
+                self.logger.info("Memo hit for '%s'", normalized_path)
+                return memoized
+
+            cache_path = self._cache_path(st, level_adjustment)
+            if cache_path and os.path.exists(cache_path):
+                self.logger.info("Cache hit for '%s'", normalized_path)
+                fd = os.open(cache_path, os.O_RDONLY)
+                try:
+                    data = os.read(fd, os.fstat(fd).st_size)
+                finally:
+                    os.close(fd)
+                content = data.decode('utf-8')
+                # Remember the encoded form so save() can skip re-encoding
+                self._encoded = (content, data)
+                _memo_store(memo_key, content)
+                return content
+
+            # Very large notes are lowered line-by-line so peak memory stays
+            # bounded instead of holding the document plus a copy per pass
+            if st.st_size > _STREAM_THRESHOLD:
+                content = self._convert_streaming(level_adjustment)
+                if content is not None:
+                    data = content.encode('utf-8')
+                    self._encoded = (content, data)
+                    self._cache_store(cache_path, data)
+                    _memo_store(memo_key, content)
+                return content
+
+            # Read the content in one raw read instead of going through the
+            # buffered text layer, then decode the whole buffer at once
+            self.logger.debug("Reading content from %s", self.input_file)
+            fd = os.open(self.input_file, os.O_RDONLY)
+            try:
+                data = os.read(fd, os.fstat(fd).st_size)
+            finally:
+                os.close(fd)
             try:
-                with open(self.input_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                self.logger.debug(f"Successfully read {len(content)} characters")
-                self.logger.debug(f"First 100 characters: {repr(content[:100])}")
+                content = data.decode('utf-8')
+                self.logger.debug("Successfully read %d characters", len(content))
+                self.logger.debug("First 100 characters: %r", content[:100])
             except UnicodeDecodeError:
-                # Try with another encoding if UTF-8 fails
+                # Try with another encoding if UTF-8 fails; no second disk
+                # read is needed since we already hold the raw bytes
                 self.logger.warning("UTF-8 decoding failed, trying with latin-1")
-                with open(self.input_file, 'r', encoding='latin-1') as f:
-                    content = f.read()
-                self.logger.debug(f"Successfully read {len(content)} characters with latin-1 encoding")
+                content = data.decode('latin-1')
+                self.logger.debug("Successfully read %d characters with latin-1 encoding", len(content))
+
+            # Raw-fd reads skip the universal-newline translation a
+            # text-mode open did, so normalize CRLF (and lone CR) here or
+            # the frontmatter scanner and line-anchored patterns miss
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
             
             # Extract metadata from frontmatter
             self.logger.debug("Extracting frontmatter")
             self.extract_frontmatter(content)
-            
-            # Conversion process - apply each conversion step
-            self.logger.debug("Starting conversion process")
-            
-            self.logger.debug("Step 1: Removing frontmatter")
-            content = self.remove_frontmatter(content)
-            
-            self.logger.debug("Step 2: Removing comments")
-            content = self.remove_comments(content)
-            
-            self.logger.debug("Step 3: Converting headers")
-            content = self.convert_headers(content, level_adjustment)
-            
-            self.logger.debug("Step 4: Converting lists")
-            content = self.convert_lists(content)
-            
-            self.logger.debug("Step 5: Converting images")
-            content = self.convert_images(content)
-            
-            self.logger.debug("Step 6: Converting internal links")
-            content = self.convert_internal_links(content)
-            
-            self.logger.debug("Step 7: Converting emphasis")
-            content = self.convert_emphasis(content)
-            
-            self.logger.debug("Step 8: Converting code blocks")
-            content = self.convert_code_blocks(content)
-            
-            self.logger.debug("Step 9: Preserving math")
-            content = self.preserve_math(content)
-            
+
+            if len(content) < _SMALL_THRESHOLD:
+                # Tiny notes: one walk through the lowering machine beats
+                # the pipeline's per-pass call and scan overhead
+                self.logger.debug("Small input, using single-pass lowering")
+                content = _Lowerer(self, level_adjustment).lower(
+                    content.splitlines(keepends=True))
+            else:
+                # Conversion process - apply each conversion step
+                self.logger.debug("Starting conversion process")
+
+                self.logger.debug("Step 1: Removing frontmatter")
+                content = self.remove_frontmatter(content)
+
+                # Comments can span lines, so they are stripped while the
+                # content is one contiguous string; once the header pass
+                # segments the buffer a multi-line '%%...%%' can no longer
+                # match across segment boundaries
+                self.logger.debug("Step 2: Removing comments")
+                if '%%' in content:
+                    content = _BLOCK_COMMENT_RE.sub(_block_comment_repl, content)
+
+                # Lists, headers and the fused inline pass run per region
+                # lying outside code fences and math blocks, so those keep
+                # their contents verbatim exactly like the line-walking
+                # lowering machine
+                self.logger.debug("Step 3: Converting markdown regions")
+                if '```' in content or '$$' in content:
+                    parts = []
+                    last = 0
+                    for m in _PROTECTED_RE.finditer(content):
+                        parts.append(self._convert_region(
+                            content[last:m.start()], level_adjustment))
+                        parts.append(m.group(0))
+                        last = m.end()
+                    parts.append(self._convert_region(content[last:],
+                                                      level_adjustment))
+                    content = ''.join(parts)
+                else:
+                    content = self._convert_region(content, level_adjustment)
+
+                self.logger.debug("Step 4: Converting code blocks")
+                content = self.convert_code_blocks(content)
+
+                # Math blocks are already valid LaTeX and pass through
+                # untouched
+
             # Add section comment
-            self.logger.debug("Step 10: Adding section comment")
+            self.logger.debug("Adding section comment")
             content = self.add_section_comment(content)
             
             self.logger.info("Conversion completed successfully")
-            self.logger.debug(f"Final content length: {len(content)} characters")
+            self.logger.debug("Final content length: %d characters", len(content))
+            # Encode once; both the cache write and a later save() reuse it
+            data = content.encode('utf-8')
+            self._encoded = (content, data)
+            self._cache_store(cache_path, data)
+            _memo_store(memo_key, content)
             return content
         except Exception as e:
-            self.logger.error(f"Error during conversion: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error during conversion")
+            return None
+
+    def _cache_path(self, st, level_adjustment):
+        """
+        Build the cache file path for the input file and its settings
+
+        Returns:
+            str: The cache path, or None if the cache is unavailable
+        """
+        try:
+            key = hashlib.blake2b(
+                f'{self._input_abspath}|{st.st_mtime_ns}|{st.st_size}'
+                f'|{level_adjustment}|{self.figures_dir}|{__version__}'.encode(),
+                digest_size=16).hexdigest()
+            return os.path.join(_cache_dir(), f'{key}.tex')
+        except Exception as e:
+            self.logger.warning(f"Could not compute cache key: {e}")
+            return None
+
+    def _cache_store(self, cache_path, data):
+        """Write converted content (as bytes) to the cache with an atomic rename"""
+        if not cache_path:
+            return
+        try:
+            cache_dir = os.path.dirname(cache_path)
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, cache_path)
+            _evict_cache(cache_dir)
+        except Exception as e:
+            # The cache is best-effort; a failure here must not fail the run
+            self.logger.warning(f"Could not write cache entry: {e}")
+
+    def _convert_streaming(self, level_adjustment=0):
+        """
+        Streaming conversion path for very large input files
+
+        Returns:
+            str: The converted LaTeX content
+        """
+        try:
+            self.logger.info("Input exceeds %d bytes, using streaming conversion", _STREAM_THRESHOLD)
+            try:
+                with open(self.input_file, 'r', encoding='utf-8', buffering=1 << 16) as f:
+                    content = _Lowerer(self, level_adjustment).lower(f)
+            except UnicodeDecodeError:
+                self.logger.warning("UTF-8 decoding failed, trying with latin-1")
+                with open(self.input_file, 'r', encoding='latin-1', buffering=1 << 16) as f:
+                    content = _Lowerer(self, level_adjustment).lower(f)
+
+            content = self.add_section_comment(content)
+            self.logger.info("Streaming conversion completed successfully")
+            return content
+        except Exception as e:
+            self.logger.exception("Error during streaming conversion")
             return None
 
     def save(self, latex_content, overwrite_mode='overwrite'):
@@ -625,7 +1214,7 @@ class ObsidianLatexSectionConverter:
             bool: True if saved successfully, False otherwise
         """
         try:
-            self.logger.debug(f"Saving content to {self.output_file} (mode: {overwrite_mode})")
+            self.logger.debug("Saving content to %s (mode: %s)", self.output_file, overwrite_mode)
             if not latex_content:
                 self.logger.error("No content to save")
                 return False
@@ -634,38 +1223,85 @@ class ObsidianLatexSectionConverter:
             output_dir = os.path.dirname(self.output_file)
             if output_dir and not os.path.exists(output_dir):
                 os.makedirs(output_dir)
-                self.logger.debug(f"Created output directory: {output_dir}")
+                self.logger.debug("Created output directory: %s", output_dir)
             
             # Check if file already exists
             if os.path.exists(self.output_file):
-                self.logger.debug(f"Output file already exists: {self.output_file}")
+                self.logger.debug("Output file already exists: %s", self.output_file)
                 
                 if overwrite_mode == 'skip':
                     self.logger.info(f"Skipping existing file '{self.output_file}'")
                     return True
                 
                 elif overwrite_mode == 'backup':
-                    # Create backup with timestamp
+                    # Create backup with timestamp. os.replace is an atomic
+                    # rename, so the backup costs one syscall instead of
+                    # copying the old file byte-by-byte through Python.
                     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                     backup_file = f"{self.output_file}.{timestamp}.bak"
                     try:
-                        shutil.copy2(self.output_file, backup_file)
+                        os.replace(self.output_file, backup_file)
                         self.logger.info(f"Created backup of existing file: {backup_file}")
                     except Exception as e:
-                        self.logger.warning(f"Failed to create backup: {e}")
-                        self.logger.error(traceback.format_exc())
+                        self.logger.exception("Failed to create backup")
             
-            # Save the file
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                f.write(latex_content)
+            # Save the file: reuse the bytes convert() already encoded when
+            # they belong to this exact content, then write through a raw fd
+            # in a single syscall instead of the buffered text layer
+            if self._encoded is not None and self._encoded[0] is latex_content:
+                data = self._encoded[1]
+            else:
+                data = latex_content.encode('utf-8')
+            fd = os.open(self.output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
             
             self.logger.info(f"LaTeX content saved to '{self.output_file}'")
             return True
         except Exception as e:
-            self.logger.error(f"Failed to save output: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Failed to save output")
             return False
 
+    @classmethod
+    def convert_batch(cls, pairs, figures_dir=None, level_adjustment=0,
+                      verbose=False, log_file="obsidian2latex.log"):
+        """
+        Convert several (input_file, output_file) pairs with one converter
+
+        A single instance (and thus a single logger/handler setup) is
+        reused across all files; the compiled patterns are module-level
+        already, so per-file cost is just the conversion itself.
+
+        Args:
+            pairs (list): (input_file, output_file) tuples
+            figures_dir (str): Path to the figures directory
+            level_adjustment (int): Header level adjustment for all files
+            verbose (bool): Enable verbose logging
+            log_file (str): Path to the log file
+
+        Returns:
+            list: One bool per pair, True where conversion and saving succeeded
+        """
+        converter = cls(figures_dir=figures_dir, verbose=verbose, log_file=log_file)
+        results = []
+        for input_file, output_file in pairs:
+            converter.input_file = input_file
+            converter.output_file = output_file
+            converter._input_basename = os.path.basename(input_file)
+            converter._input_abspath = os.path.abspath(input_file)
+            converter._frontmatter_end = None
+            converter._encoded = None
+            converter.metadata = {'title': '', 'tags': []}
+
+            latex_content = converter.convert(level_adjustment=level_adjustment)
+            success = bool(latex_content) and converter.save(latex_content)
+            if success:
+                converter.process_images()
+            results.append(success)
+        return results
+
     def convert_and_save(self):
         """
         Convert the Obsidian markdown file and save the result
@@ -683,6 +1319,5 @@ class ObsidianLatexSectionConverter:
                 return success
             return False
         except Exception as e:
-            self.logger.error(f"Error in convert_and_save: {e}")
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("Error in convert_and_save")
             return False
\ No newline at end of file
@@ -22,6 +22,10 @@ setup(
     install_requires=[
         "Pillow>=8.0.0",  # For image processing
     ],
+    extras_require={
+        "re2": ["google-re2"],  # Linear-time regex engine for the inline pass
+        "yaml": ["PyYAML"],  # C-backed frontmatter parsing
+    },
     entry_points={
         "console_scripts": [
             "obsidian_to_latex=obsidian_to_latex.CLI:main",